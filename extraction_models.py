@@ -0,0 +1,68 @@
+"""
+Pydantic models for the comprehensive extraction schema
+
+These mirror the JSON structure requested by the extraction prompt in
+comprehensive_website_scraper.py, so LLM output can be validated and, with
+providers that support structured outputs, enforced server-side via a
+json_schema response format.
+"""
+
+from typing import List, Optional
+from pydantic import BaseModel
+
+
+class ContactInfo(BaseModel):
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    address: Optional[str] = None
+
+
+class Metadata(BaseModel):
+    url: Optional[str] = None
+    title: Optional[str] = None
+    description: Optional[str] = None
+    language: Optional[str] = None
+    last_updated: Optional[str] = None
+    word_count: Optional[str] = None
+
+
+class Content(BaseModel):
+    main_heading: Optional[str] = None
+    sub_headings: List[str] = []
+    main_content: Optional[str] = None
+    key_points: List[str] = []
+    call_to_actions: List[str] = []
+
+
+class Navigation(BaseModel):
+    menu_items: List[str] = []
+    breadcrumbs: List[str] = []
+    footer_links: List[str] = []
+
+
+class Media(BaseModel):
+    images: List[str] = []
+    videos: List[str] = []
+    documents: List[str] = []
+
+
+class BusinessInfo(BaseModel):
+    company_name: Optional[str] = None
+    contact_info: ContactInfo = ContactInfo()
+    social_media: List[str] = []
+    pricing: Optional[str] = None
+
+
+class Technical(BaseModel):
+    technologies: List[str] = []
+    forms: List[str] = []
+    external_links: List[str] = []
+
+
+class ExtractedPage(BaseModel):
+    metadata: Metadata = Metadata()
+    content: Content = Content()
+    navigation: Navigation = Navigation()
+    media: Media = Media()
+    business_info: BusinessInfo = BusinessInfo()
+    technical: Technical = Technical()
@@ -14,10 +14,23 @@ Features:
 """
 
 import asyncio
+import hashlib
 import json
+import os
 import sys
+import time
+from pathlib import Path
+from typing import Final
 from comprehensive_website_scraper import ComprehensiveWebsiteScraper  # Added explicit import
 
+try:
+    # libuv-based event loop: drop-in replacement, noticeably faster for the
+    # fully I/O-bound scraping workload; stock asyncio is used when absent
+    import uvloop
+    uvloop.install()
+except ImportError:
+    uvloop = None
+
 # Global configuration - Change this URL to test different websites
 TARGET_URL = "https://rscolman.com.ng/"
 
@@ -32,6 +45,135 @@ OUTPUT_DIR = "scraped_data"  # Aligned with scraper class
 # - "all": All formats (JSON, markdown, HTML, raw)
 OUTPUT_FORMAT = "json"
 
+# Byte-identical prefix shared by every custom extraction prompt so the
+# provider-side prompt cache can reuse the tokenized prefix across tasks;
+# only the schema body after it varies
+SHARED_PREFIX = """
+    Extract the following information from this webpage and return as JSON.
+    Return ONLY valid JSON, no additional text.
+
+    Schema:
+"""
+
+# Task prompts are built once at import; their SHA-256 fingerprints are
+# precomputed so per-call cache keys never re-hash the full prompt text
+PRODUCT_PROMPT: Final[str] = SHARED_PREFIX + """
+    {
+        "product_name": "name of the main product or service",
+        "description": "brief description of what this website offers",
+        "key_features": ["list of main features or capabilities"],
+        "target_audience": "who this product is for",
+        "pricing_info": "any pricing information available",
+        "contact_info": "how to contact or get support"
+    }
+    """
+
+TECHNICAL_PROMPT: Final[str] = SHARED_PREFIX + """
+    {
+        "technologies": ["list of technologies, frameworks, or tools mentioned"],
+        "api_endpoints": ["list of API endpoints if any"],
+        "installation": "installation or setup instructions",
+        "dependencies": ["list of dependencies or requirements"],
+        "deployment": "deployment or hosting information",
+        "documentation": "links to documentation or guides"
+    }
+
+    Focus on technical details, code tasks, and developer information.
+    """
+
+_PRODUCT_KEY: Final[str] = hashlib.sha256(PRODUCT_PROMPT.encode()).hexdigest()
+_TECHNICAL_KEY: Final[str] = hashlib.sha256(TECHNICAL_PROMPT.encode()).hexdigest()
+
+# One scraper shared by all tasks: reuses the HTTP connection pool, the
+# extraction caches, and a single started browser session
+_SCRAPER = None
+# Lazy for the same reason get_scraper is: on 3.8/3.9 a lock built at
+# import time binds the import-time loop, not the one asyncio.run starts
+_SCRAPER_LOCK = None
+
+def _scraper_lock() -> asyncio.Lock:
+    global _SCRAPER_LOCK
+    if _SCRAPER_LOCK is None:
+        _SCRAPER_LOCK = asyncio.Lock()
+    return _SCRAPER_LOCK
+
+async def get_scraper() -> ComprehensiveWebsiteScraper:
+    """Lazily create and start the shared scraper
+
+    Browser launch costs hundreds of milliseconds, so it happens once; every
+    task reuses the same entered instance. The lock makes concurrent first
+    calls (run_all_tasks gathers all tasks at once) wait until the browser
+    is fully started instead of racing a half-entered scraper.
+    close_scraper() pairs with this at program end.
+    """
+    global _SCRAPER
+    async with _scraper_lock():
+        if _SCRAPER is None:
+            scraper = ComprehensiveWebsiteScraper(output_dir=OUTPUT_DIR)
+            await scraper.__aenter__()
+            _SCRAPER = scraper
+    return _SCRAPER
+
+async def close_scraper():
+    """Shut down the shared scraper if it was started"""
+    global _SCRAPER
+    async with _scraper_lock():
+        if _SCRAPER is not None:
+            scraper, _SCRAPER = _SCRAPER, None
+            await scraper.__aexit__(None, None, None)
+
+# On-disk cache for whole scrape results, keyed by (url, strategy, prompt);
+# repeat demo runs against the same target skip the crawl and LLM entirely
+CACHE_DIR = Path(OUTPUT_DIR) / ".example_cache"
+CACHE_TTL = 24 * 3600
+
+async def cached_scrape(scraper, url: str, strategy: str, output_formats: list, custom_prompt: str = None, prompt_key: str = None) -> dict:
+    """Scrape through a small on-disk result cache
+
+    A hit replaces the multi-second crawl + LLM round trip with a single
+    file read; on a miss the scraper's own request/extraction caches still
+    catch the expensive LLM call for unchanged pages. Callers with a
+    precomputed prompt fingerprint pass it as prompt_key so the full prompt
+    text is never re-hashed.
+    """
+    key = hashlib.sha256(f"{url}|{strategy}|{prompt_key or custom_prompt or ''}".encode()).hexdigest()
+    cache_path = CACHE_DIR / f"{key}.json"
+    try:
+        if time.time() - cache_path.stat().st_mtime < CACHE_TTL:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            print(f"⚡ Cache hit for {url} ({strategy})")
+            return cached
+    except (OSError, json.JSONDecodeError):
+        pass
+
+    result = await scraper.scrape_website(
+        url=url,
+        strategy=strategy,
+        output_formats=output_formats,
+        custom_prompt=custom_prompt
+    )
+    if result.get("success"):
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, default=str)
+    return result
+
+def summarize_results(results: list) -> tuple:
+    """Single-pass batch summary: (successful, failed, total characters)
+
+    One tight loop over a couple of scalar fields per result instead of
+    filtering the full result dicts once per statistic.
+    """
+    successful = failed = total_chars = 0
+    for r in results:
+        if isinstance(r, dict) and r.get("success", False):
+            successful += 1
+            total_chars += r.get("metadata", {}).get("raw_content_length", 0)
+        else:
+            failed += 1
+    return successful, failed, total_chars
+
 def get_output_formats(output_format: str) -> list:
     """Convert universal output format to list of formats"""
     format_mapping = {
@@ -47,17 +189,38 @@ def get_output_formats(output_format: str) -> list:
     
     return format_mapping[output_format]
 
+# OUTPUT_FORMAT is a module constant, so the format list is resolved once at
+# import; a tuple keeps it immutable and shareable across tasks
+_RESOLVED_FORMATS: Final[tuple] = tuple(get_output_formats(OUTPUT_FORMAT))
+
+# Task banners are pure functions of module constants, so they are built once
+# and written with a single call instead of six prints per task entry;
+# QUIET=1 suppresses them for scripted runs
+_QUIET = bool(os.getenv("QUIET"))
+BANNERS: Final[dict] = {
+    name: (f"\n{icon} {title}\n" + "=" * 50 +
+           f"\nTarget: {target}\nStrategy: {strategy}\nOutput: {OUTPUT_FORMAT}\n")
+    for name, icon, title, target, strategy in [
+        ("simple", "1️⃣", "Simple Scraping task", TARGET_URL, "Simple (no LLM)"),
+        ("llm", "2️⃣", "LLM Scraping task", TARGET_URL, "LLM-based extraction"),
+        ("comprehensive", "3️⃣", "Comprehensive Scraping task", TARGET_URL, "Comprehensive (LLM + chunking)"),
+        ("batch", "4️⃣", "Batch Scraping task", "Multiple related URLs", "Comprehensive"),
+        ("custom", "5️⃣", "Custom Extraction task", TARGET_URL, "LLM with custom prompt"),
+    ]
+}
+
+def print_banner(name: str):
+    """Emit a precomputed task banner unless quiet mode is on"""
+    if not _QUIET:
+        sys.stdout.write(BANNERS[name])
+
 async def simple_scraping_task():
     """Task 1: Simple scraping without LLM (fastest)"""
-    print(f"\n1️⃣ Simple Scraping task")
-    print("=" * 50)
-    print(f"Target: {TARGET_URL}")
-    print("Strategy: Simple (no LLM)")
-    print(f"Output: {OUTPUT_FORMAT}")
+    print_banner("simple")
     
-    scraper = ComprehensiveWebsiteScraper(output_dir=OUTPUT_DIR)  # Pass output_dir
+    scraper = await get_scraper()  # Shared instance
     
-    output_formats = get_output_formats(OUTPUT_FORMAT)
+    output_formats = _RESOLVED_FORMATS
     
     result = await scraper.scrape_website(
         url=TARGET_URL,
@@ -77,37 +240,14 @@ async def simple_scraping_task():
 
 async def llm_scraping_task():
     """Task 2: LLM-based extraction with custom prompt"""
-    print(f"\n2️⃣ LLM Scraping task")
-    print("=" * 50)
-    print(f"Target: {TARGET_URL}")
-    print("Strategy: LLM-based extraction")
-    print(f"Output: {OUTPUT_FORMAT}")
+    print_banner("llm")
     
-    scraper = ComprehensiveWebsiteScraper(output_dir=OUTPUT_DIR)
+    scraper = await get_scraper()
     
-    output_formats = get_output_formats(OUTPUT_FORMAT)
+    output_formats = _RESOLVED_FORMATS
     
-    custom_prompt = """
-    Extract the following information from this webpage and return as JSON:
-    
-    {
-        "product_name": "name of the main product or service",
-        "description": "brief description of what this website offers",
-        "key_features": ["list of main features or capabilities"],
-        "target_audience": "who this product is for",
-        "pricing_info": "any pricing information available",
-        "contact_info": "how to contact or get support"
-    }
-    
-    Return ONLY valid JSON, no additional text.
-    """
-    
-    result = await scraper.scrape_website(
-        url=TARGET_URL,
-        strategy="llm",
-        output_formats=output_formats,
-        custom_prompt=custom_prompt
-    )
+    result = await cached_scrape(scraper, TARGET_URL, "llm", output_formats,
+                                 PRODUCT_PROMPT, prompt_key=_PRODUCT_KEY)
     
     if result["success"]:
         print(f"✅ Success! JSON saved to: {result['saved_files']['json']}")
@@ -119,7 +259,9 @@ async def llm_scraping_task():
                     if isinstance(value, list):
                         print(f"   {key}: {len(value)} items")
                     else:
-                        print(f"   {key}: {str(value)[:50]}...")
+                        # repr truncation works on the dict value directly, no
+                        # re-serialization of the extracted JSON needed
+                        print(f"   {key}: {repr(value)[:50]}...")
     else:
         print(f"❌ Error: {result['error']['message']}")
     
@@ -127,22 +269,14 @@ async def llm_scraping_task():
 
 async def comprehensive_scraping_task():
     """Task 3: Comprehensive scraping with all output formats"""
-    print(f"\n3️⃣ Comprehensive Scraping task")
-    print("=" * 50)
-    print(f"Target: {TARGET_URL}")
-    print("Strategy: Comprehensive (LLM + chunking)")
-    print(f"Output: {OUTPUT_FORMAT}")
+    print_banner("comprehensive")
     
-    scraper = ComprehensiveWebsiteScraper(output_dir=OUTPUT_DIR)
+    scraper = await get_scraper()
     
-    output_formats = get_output_formats(OUTPUT_FORMAT)
-    
-    result = await scraper.scrape_website(
-        url=TARGET_URL,
-        strategy="comprehensive",
-        output_formats=output_formats
-    )
+    output_formats = _RESOLVED_FORMATS
     
+    result = await cached_scrape(scraper, TARGET_URL, "comprehensive", output_formats)
+
     if result["success"]:
         print(f"✅ Success! All formats saved:")
         for format_type, file_path in result["saved_files"].items():
@@ -158,15 +292,11 @@ async def comprehensive_scraping_task():
 
 async def batch_scraping_task():
     """Task 4: Batch scraping multiple related URLs"""
-    print(f"\n4️⃣ Batch Scraping task")
-    print("=" * 50)
-    print("Target: Multiple related URLs")
-    print("Strategy: Comprehensive")
-    print(f"Output: {OUTPUT_FORMAT}")
+    print_banner("batch")
     
-    scraper = ComprehensiveWebsiteScraper(output_dir=OUTPUT_DIR)
+    scraper = await get_scraper()
     
-    output_formats = get_output_formats(OUTPUT_FORMAT)
+    output_formats = _RESOLVED_FORMATS
     
     # Use only the target URL for simplicity
     related_urls = [TARGET_URL]  # Focus on TARGET_URL
@@ -174,23 +304,30 @@ async def batch_scraping_task():
     print(f"📋 URLs to scrape:")
     for i, url in enumerate(related_urls, 1):
         print(f"   {i}. {url}")
-    
+
+    # URLs fan out concurrently inside scrape_multiple_websites, bounded
+    # globally and per host, instead of a fixed delay between sites
+    print(f"🚀 Scraping concurrently (max {scraper.max_concurrency} in flight, "
+          f"{scraper.per_host_concurrency} per host)")
+
     results = await scraper.scrape_multiple_websites(
         urls=related_urls,
         strategy="comprehensive",
-        output_formats=output_formats,
-        delay=2
+        output_formats=output_formats
     )
     
-    successful = [r for r in results if r.get("success", False)]
-    failed = [r for r in results if not r.get("success", False)]
-    
+    ok_count, fail_count, total_chars = summarize_results(results)
+
     print(f"\n📊 Batch Scraping Summary:")
-    print(f"   ✅ Successful: {len(successful)}/{len(related_urls)}")
-    print(f"   ❌ Failed: {len(failed)}")
+    print(f"   ✅ Successful: {ok_count}/{len(related_urls)}")
+    print(f"   ❌ Failed: {fail_count}")
+    print(f"   📄 Content scraped: {total_chars} characters")
     print(f"   📁 Results saved to: {scraper.output_dir}/")
-    
-    if failed:
+
+    if fail_count:
+        # Only materialized on the failure path; the all-success common case
+        # never re-scans the results
+        failed = [r for r in results if not (isinstance(r, dict) and r.get("success", False))]
         print(f"   ⚠️ Failed URLs:")
         for result in failed:
             if isinstance(result, dict) and 'url' in result and 'error' in result:
@@ -202,38 +339,14 @@ async def batch_scraping_task():
 
 async def custom_extraction_task():
     """Task 5: Custom extraction with specific data focus"""
-    print(f"\n5️⃣ Custom Extraction task")
-    print("=" * 50)
-    print(f"Target: {TARGET_URL}")
-    print("Strategy: LLM with custom prompt")
-    print(f"Output: {OUTPUT_FORMAT}")
+    print_banner("custom")
     
-    scraper = ComprehensiveWebsiteScraper(output_dir=OUTPUT_DIR)
+    scraper = await get_scraper()
     
-    output_formats = get_output_formats(OUTPUT_FORMAT)
+    output_formats = _RESOLVED_FORMATS
     
-    technical_prompt = """
-    Extract technical information from this webpage and return as JSON:
-    
-    {
-        "technologies": ["list of technologies, frameworks, or tools mentioned"],
-        "api_endpoints": ["list of API endpoints if any"],
-        "installation": "installation or setup instructions",
-        "dependencies": ["list of dependencies or requirements"],
-        "deployment": "deployment or hosting information",
-        "documentation": "links to documentation or guides"
-    }
-    
-    Focus on technical details, code tasks, and developer information.
-    Return ONLY valid JSON.
-    """
-    
-    result = await scraper.scrape_website(
-        url=TARGET_URL,
-        strategy="llm",
-        output_formats=output_formats,
-        custom_prompt=technical_prompt
-    )
+    result = await cached_scrape(scraper, TARGET_URL, "llm", output_formats,
+                                 TECHNICAL_PROMPT, prompt_key=_TECHNICAL_KEY)
     
     if result["success"]:
         print(f"✅ Success! Technical data saved to: {result['saved_files']['json']}")
@@ -247,14 +360,14 @@ async def custom_extraction_task():
                         if value:
                             print(f"      tasks: {', '.join(value[:3])}")
                     else:
-                        print(f"   {key}: {str(value)[:100]}...")
+                        print(f"   {key}: {repr(value)[:100]}...")
     else:
         print(f"❌ Error: {result['error']['message']}")
     
     return result
 
 async def run_all_tasks():
-    """Run all tasks sequentially"""
+    """Run all tasks concurrently over the shared scraper"""
     print("🚀 Comprehensive Website Scraper - All tasks")
     print("=" * 60)
     print(f"🎯 Target URL: {TARGET_URL}")
@@ -263,14 +376,28 @@ async def run_all_tasks():
     print("=" * 60)
     
     results = {}
-    
+
     try:
-        results["simple"] = await simple_scraping_task()
-        results["llm"] = await llm_scraping_task()
-        results["comprehensive"] = await comprehensive_scraping_task()
-        results["batch"] = await batch_scraping_task()
-        results["custom"] = await custom_extraction_task()
-        
+        # The tasks are independent and I/O-bound, so they run concurrently
+        # under one shared browser session; the scraper's request cache means
+        # the shared TARGET_URL is only extracted once per distinct prompt
+        task_names = ["simple", "llm", "comprehensive", "batch", "custom"]
+        try:
+            outcomes = await asyncio.gather(
+                simple_scraping_task(),
+                llm_scraping_task(),
+                comprehensive_scraping_task(),
+                batch_scraping_task(),
+                custom_extraction_task(),
+                return_exceptions=True
+            )
+        finally:
+            await close_scraper()
+        results = dict(zip(task_names, outcomes))
+        for name, outcome in results.items():
+            if isinstance(outcome, Exception):
+                print(f"❌ Task {name} failed: {outcome}")
+
         print(f"\n🎉 All tasks completed!")
         print("=" * 60)
         
@@ -287,35 +414,51 @@ async def run_all_tasks():
     
     return results
 
+# Task-name dispatch table, built once at module scope instead of on every
+# run_single_task call
+_TASKS: Final[dict] = {
+    "simple": simple_scraping_task,
+    "llm": llm_scraping_task,
+    "comprehensive": comprehensive_scraping_task,
+    "batch": batch_scraping_task,
+    "custom": custom_extraction_task
+}
+
 async def run_single_task(task_name: str):
     """Run a single task by name"""
-    tasks = {
-        "simple": simple_scraping_task,
-        "llm": llm_scraping_task,
-        "comprehensive": comprehensive_scraping_task,
-        "batch": batch_scraping_task,
-        "custom": custom_extraction_task
-    }
-    
-    if task_name not in tasks:
+    task = _TASKS.get(task_name)
+    if task is None:
         print(f"❌ Unknown task: {task_name}")
-        print(f"Available tasks: {', '.join(tasks.keys())}")
+        print(f"Available tasks: {', '.join(_TASKS)}")
         return None
-    
+
     print(f"🎯 Running task: {task_name}")
     try:
-        return await tasks[task_name]()
+        return await task()
     except Exception as e:
         print(f"❌ Error running task {task_name}: {e}")
         return None
+    finally:
+        await close_scraper()
+
+def _run(coro_factory):
+    """Run the entrypoint coroutine on uvloop when possible
+
+    On Python 3.11+ the loop is pinned explicitly through asyncio.Runner;
+    older interpreters rely on the uvloop.install() policy set at import.
+    """
+    if uvloop is not None and hasattr(asyncio, "Runner"):
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            return runner.run(coro_factory())
+    return asyncio.run(coro_factory())
 
 if __name__ == "__main__":
     try:
         if len(sys.argv) > 1:
             task_name = sys.argv[1].lower()
-            asyncio.run(run_single_task(task_name))
+            _run(lambda: run_single_task(task_name))
         else:
-            asyncio.run(run_all_tasks())
+            _run(run_all_tasks)
     except Exception as e:
         print(f"❌ Fatal error: {e}")
         sys.exit(1)
\ No newline at end of file